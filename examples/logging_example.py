@@ -10,6 +10,7 @@ from fastapi_logging.format import (
     LOGGING_DEFAULT_FORMAT,
     FileLogFormatter,
 )
+from fastapi_logging.handlers import buffered_handler, queue_handler
 from pydantic import BaseModel
 
 app = FastAPI()
@@ -27,7 +28,8 @@ logger = logging.getLogger(__name__)
 handler = TimedRotatingFileHandler(filename="/tmp/fastapilogging.log", when="d", interval=1, backupCount=14)
 formatter = FileLogFormatter(FILE_DEFAULT_FORMAT)
 handler.setFormatter(formatter)
-logger.addHandler(handler)
+# file writes are batched and done in a background thread
+logger.addHandler(queue_handler(buffered_handler(handler)))
 
 extra_logger = LoggingExtraLogger(logger_name=__name__)
 
@@ -18,9 +18,12 @@ init_loguru(app, traceback_to_console=True, format=LOGURU_FORMAT)
 # init_loguru(app)
 extra_logger = LoguruExtraLogger()
 # next actions are not necessary, they only add file handlers
-logger.add(sink="/tmp/fastapilogging.log", format=LOGURU_FORMAT, rotation="1 day")
+# enqueue=True moves file writes off the event loop
+logger.add(sink="/tmp/fastapilogging.log", format=LOGURU_FORMAT, rotation="1 day", enqueue=True)
 # if you want log to file without traceback, you can use loguru_format_without_traceback function
-# logger.add(sink="/tmp/fastapilogging.log", format=loguru_format_without_traceback(LOGURU_FORMAT), rotation="1 day")
+# logger.add(
+#     sink="/tmp/fastapilogging.log", format=loguru_format_without_traceback(LOGURU_FORMAT), rotation="1 day", enqueue=True
+# )
 
 
 @app.get("/err")
@@ -1,4 +1,7 @@
-import inspect
+import os
+import reprlib
+import sys
+from itertools import islice
 from logging import (
     CRITICAL,
     DEBUG,
@@ -10,26 +13,58 @@ from logging import (
     _levelToName,
     getLogger,
 )
-from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from loguru import logger
 
-from .schemas import RequestResponseFields
+from .handlers import loguru_level_enabled
+from .schemas import EMPTY_FIELDS
 
 DICT_STR_T = Dict[str, Any]
 
+# caller filename -> path relative to cwd, filled lazily by ExtraLogger._log
+_PATH_CACHE: Dict[str, str] = {}
+_CWD_PREFIX = os.path.join(os.getcwd(), "")
 
-def path_subtraction(path_one: Path, path_two: Path) -> Path:
-    path_one_parts = path_one.parts
-    path_two_parts = path_two.parts
-    i = 0
-    for i in range(min(len(path_one_parts), len(path_two_parts))):
-        if path_two_parts[i] != path_one_parts[i]:
-            break
-    if i != len(path_one_parts):
-        i += 1
-    return Path("/".join(path_one_parts[i:]))
+
+class _OrderedRepr(reprlib.Repr):
+    """reprlib.Repr which keeps dict insertion order, as repr() does, instead of sorting the keys"""
+
+    def repr_dict(self, x: dict, level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        pieces = [
+            f"{self.repr1(key, level - 1)}: {self.repr1(value, level - 1)}"
+            for key, value in islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append("...")
+        return "{" + ", ".join(pieces) + "}"
+
+
+# bounded repr for function arguments, so big request bodies don't blow up log records
+_repr = _OrderedRepr()
+_repr.maxstring = 256
+_repr.maxother = 256
+_repr.maxdict = 20
+_repr.maxlist = 20
+
+
+def _arguments_repr(values: DICT_STR_T, arguments: Tuple[str, ...]) -> str:
+    """Same as str() of arguments dict, but every value is cut by '_repr' limits"""
+    return "{" + ", ".join(f"{arg!r}: {_repr.repr(values[arg])}" for arg in arguments) + "}"
+
+
+def _relpath(filename: str) -> str:
+    """Strip current working directory from 'filename'. The cwd is reread only if 'filename' is outside of it"""
+    global _CWD_PREFIX
+    if not filename.startswith(_CWD_PREFIX):
+        _CWD_PREFIX = os.path.join(os.getcwd(), "")
+        if not filename.startswith(_CWD_PREFIX):
+            return filename
+    return filename[len(_CWD_PREFIX) :]
 
 
 class ExtraLogger:
@@ -42,9 +77,11 @@ class ExtraLogger:
 
     def __init__(
         self,
-        additional_fields: DICT_STR_T = {},
+        additional_fields: Optional[DICT_STR_T] = None,
     ) -> None:
-        self.additional_fields = additional_fields
+        self.additional_fields = additional_fields or {}
+        # blank fields merged with additional ones, copied on every log call
+        self._base_fields = {**EMPTY_FIELDS, **self.additional_fields}
 
     def info(self, msg: str, extra: Optional[DICT_STR_T] = None, **kwargs):
         self._log(INFO, msg, extra, **kwargs)
@@ -67,6 +104,9 @@ class ExtraLogger:
     def fatal(self, msg: str, extra: Optional[DICT_STR_T] = None, **kwargs):
         self._log(FATAL, msg, extra, **kwargs)
 
+    def _is_enabled(self, level: int) -> bool:
+        raise NotImplementedError()
+
     def _logger_log(self, level: int, msg: str, extra: DICT_STR_T):
         raise NotImplementedError()
 
@@ -76,17 +116,19 @@ class ExtraLogger:
         msg: str,
         extra: Optional[DICT_STR_T] = None,
     ):
-        caller_module = inspect.stack()[2]
-        arguments, _, _, values = inspect.getargvalues(caller_module.frame)
-        extra_ = RequestResponseFields().dict()
-        file_path = path_subtraction(Path(caller_module.filename), Path.cwd())
-        extra_.update(
-            {
-                "request_path": f".{file_path} {caller_module.function}",
-                "request_body": str({arg: values[arg] for arg in arguments}),
-            }
-        )
-        extra_.update(self.additional_fields)
+        if not self._is_enabled(level):
+            return
+        frame = sys._getframe(2)
+        code = frame.f_code
+        filename = code.co_filename
+        values = frame.f_locals
+        arguments = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+        file_path = _PATH_CACHE.get(filename)
+        if file_path is None:
+            file_path = _PATH_CACHE[filename] = f".{_relpath(filename)}"
+        extra_ = self._base_fields.copy()
+        extra_["request_path"] = f"{file_path} {code.co_name}"
+        extra_["request_body"] = _arguments_repr(values, arguments)
         if extra:
             extra_.update(extra)
 
@@ -94,7 +136,7 @@ class ExtraLogger:
 
 
 class LoggingExtraLogger(ExtraLogger):
-    def __init__(self, logger_name: str, additional_fields: DICT_STR_T = {}) -> None:
+    def __init__(self, logger_name: str, additional_fields: Optional[DICT_STR_T] = None) -> None:
         """
         Parameters
         ----------
@@ -107,12 +149,15 @@ class LoggingExtraLogger(ExtraLogger):
         self.logger_ = getLogger(logger_name)
         super().__init__(additional_fields=additional_fields)
 
+    def _is_enabled(self, level: int) -> bool:
+        return self.logger_.isEnabledFor(level)
+
     def _logger_log(self, level: int, msg: str, extra: DICT_STR_T):
         self.logger_.log(level, msg, extra=extra)
 
 
 class LoguruExtraLogger(ExtraLogger):
-    def __init__(self, additional_fields: DICT_STR_T = {}) -> None:
+    def __init__(self, additional_fields: Optional[DICT_STR_T] = None) -> None:
         """
         Parameters
         ----------
@@ -122,5 +167,8 @@ class LoguruExtraLogger(ExtraLogger):
         self.logger_ = logger
         super().__init__(additional_fields=additional_fields)
 
+    def _is_enabled(self, level: int) -> bool:
+        return loguru_level_enabled(level)
+
     def _logger_log(self, level: int, msg: str, extra: DICT_STR_T):
         self.logger_.log(_levelToName[level], msg, **extra)
@@ -9,7 +9,7 @@ from typing import Callable, Literal, Optional
 import click
 
 from .handlers import InterceptHandler
-from .schemas import RequestResponseFields
+from .schemas import EMPTY_FIELDS
 
 TRACE_LOG_LEVEL = 5
 EMPTY_VALUE = ""
@@ -152,6 +152,10 @@ class FileLogFormatter(logging.Formatter):
     def __init__(self, fmt: str = FILE_DEFAULT_FORMAT, datefmt: str = DATE_DEFAULT_FORMAT) -> None:
         super().__init__(fmt, datefmt)
         self.fmt = fmt
+        # (field, default) pairs are the same for every record, so compute them once
+        fields_defaults = dict.fromkeys(LOGGING_ATTRIBUTES, EMPTY_VALUE)
+        fields_defaults.update(EMPTY_FIELDS)
+        self._fields_defaults = tuple(fields_defaults.items())
 
     def format(self, record: logging.LogRecord, *args, **kwargs) -> str:
         if record.exc_info:
@@ -160,13 +164,7 @@ class FileLogFormatter(logging.Formatter):
             exceptions = record.exc_text
         else:
             exceptions = EMPTY_VALUE
-        request_response_fields = RequestResponseFields.get_fields_names()
-        log_object = RequestResponseFields(
-            **{field: getattr(record, field) for field in set(record.__dir__()).union(request_response_fields)}
-        ).dict()
-        log_object.update(
-            {field: getattr(record, field) for field in LOGGING_ATTRIBUTES.difference(request_response_fields)}
-        )
+        log_object = {field: getattr(record, field, default) for field, default in self._fields_defaults}
         log_object.update(
             dict(
                 asctime=datetime.datetime.fromtimestamp(record.created).strftime(self.datefmt),  # type: ignore
@@ -1,17 +1,31 @@
+import atexit
 import logging
+import sys
+from copy import copy
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from queue import SimpleQueue
 from types import FrameType
+from typing import Optional
 
 from loguru import logger
 
-from .schemas import RequestResponseFields
+from .schemas import EMPTY_FIELDS as REQUEST_RESPONSE_FIELDS
 
-REQUEST_RESPONSE_FIELDS = RequestResponseFields().dict()
+_LOGGING_FILE = logging.__file__
+
+
+def loguru_level_enabled(level: int) -> bool:
+    """Check if any loguru sink accepts 'level'. Loguru keeps the lowest level of all its sinks and updates it
+    whenever a sink is added or removed, so sinks added later are taken into account
+    """
+    return level >= logger._core.min_level  # type: ignore
 
 
 class InterceptHandler(logging.Handler):
     def __init__(self, level: int = logging.NOTSET) -> None:
 
         super().__init__(level)
+        self.logger = logger.bind(**REQUEST_RESPONSE_FIELDS)
 
     def emit(self, record):
         try:
@@ -19,11 +33,70 @@ class InterceptHandler(logging.Handler):
         except ValueError:
             level = record.levelno
 
-        frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
-            frame: FrameType = frame.f_back  # type: ignore
+        # find the first frame outside of logging module, it is the one which made the logging call
+        frame: Optional[FrameType] = sys._getframe(1)
+        depth = 1
+        while frame is not None and frame.f_code.co_filename == _LOGGING_FILE:
+            frame = frame.f_back
             depth += 1
 
-        logger.bind(**REQUEST_RESPONSE_FIELDS).opt(depth=depth, exception=record.exc_info).log(
-            level, record.getMessage()
-        )
+        self.logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+class LocalQueueHandler(QueueHandler):
+    """Queue handler for listeners living in the same process.
+    Message is merged before enqueueing, but exception info is kept, so traceback output is left to the listener
+    handlers.
+    """
+
+    def __init__(self, *handlers: logging.Handler) -> None:
+        queue: SimpleQueue = SimpleQueue()
+        super().__init__(queue)
+        self.listener = QueueListener(queue, *handlers, respect_handler_level=True)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the caller may change args after the call, and the same record can go to several listener threads
+        record = copy(record)
+        if record.args and "color_message" in record.__dict__:
+            record.__dict__["color_message"] = record.__dict__["color_message"] % record.args
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+def queue_handler(*handlers: logging.Handler) -> LocalQueueHandler:
+    """Move records handling of 'handlers' to a background thread
+
+    Parameters
+    ----------
+    handlers
+        Handlers which will format and write records
+
+    Returns
+    -------
+        Handler to add to logger instead of 'handlers'. Its listener is available as 'listener' attribute
+    """
+    handler = LocalQueueHandler(*handlers)
+    handler.listener.start()
+    atexit.register(handler.listener.stop)
+    return handler
+
+
+def buffered_handler(handler: logging.Handler, capacity: int = 1024, flush_level: int = logging.ERROR) -> MemoryHandler:
+    """Collect records in memory and pass them to 'handler' in batches
+
+    Parameters
+    ----------
+    handler
+        Handler which will format and write records
+    capacity, optional
+        Number of records to collect before flushing, by default 1024
+    flush_level, optional
+        Records of this level or higher are flushed immediately, by default logging.ERROR
+
+    Returns
+    -------
+        Handler to add to logger instead of 'handler'. Remaining records are flushed on logging shutdown
+    """
+    return MemoryHandler(capacity=capacity, flushLevel=flush_level, target=handler)
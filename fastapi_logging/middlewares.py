@@ -1,7 +1,6 @@
 import http
 import json
 import logging
-import math
 import sys
 import time
 from logging import ERROR, INFO, WARNING, _levelToName
@@ -21,7 +20,19 @@ from .format import (
     loguru_reset_logging_handlers,
     reset_logging_handlers,
 )
-from .schemas import RequestResponseFields
+from .handlers import loguru_level_enabled, queue_handler
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    # same output as orjson gives
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
 
 EMPTY_VALUE = ""
 
@@ -47,23 +58,24 @@ class LogMiddleware:
         await self.set_body(request, body)
         return body
 
+    def _level_enabled(self, level: int) -> bool:
+        raise NotImplementedError()
+
     async def _log(self, level: int, message: str, extra_fields: Dict[str, Any], exception_object: Optional[Exception]):
         raise NotImplementedError()
 
     async def __call__(self, request: Request, call_next: RequestResponseEndpoint, *args, **kwargs):
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         exception_object = None
         # Request Side
         try:
             raw_request_body = await request.body()
             await self.set_body(request, raw_request_body)
-            raw_request_body = await self.get_body(request)
-            request_body = raw_request_body.decode()
+            request_body = raw_request_body.decode(errors="replace")
         except Exception:
             request_body = EMPTY_VALUE
 
         server: tuple = request.get("server", ("localhost", 9090))
-        request_headers: dict = dict(request.headers.items())
         # Response Side
         try:
             response = await call_next(request)
@@ -75,46 +87,53 @@ class LogMiddleware:
             )
             exception_object = ex
             response_headers = {}
+        if exception_object or response.status_code >= 400:
+            level = ERROR
+        elif response.status_code >= 300:
+            level = WARNING
         else:
+            level = INFO
+        # Nothing will be logged, so the response can be streamed as is
+        if not self._level_enabled(level):
+            return response
+        if exception_object is None:
             response_headers = dict(response.headers.items())
-            response_body = b""
+            buffer = bytearray()
             async for chunk in response.body_iterator:  # type: ignore
-                response_body += chunk
+                buffer.extend(chunk)
+            response_body = bytes(buffer)
             response = Response(
                 content=response_body,
                 status_code=response.status_code,
-                headers=dict(response.headers),
+                headers=response.headers,
                 media_type=response.media_type,
             )
-        duration: int = math.ceil((time.time() - start_time) * 1000)
-        # Initialization and formation of fields for request-response
-        extra_fields = RequestResponseFields(
-            request_uri=str(request.url),
-            request_referrer=request_headers.get("referer", EMPTY_VALUE),
-            request_protocol=await self.get_protocol(request),
-            request_method=request.method,
-            request_path=request.url.path,
-            request_host=f"{server[0]}:{server[1]}",
-            request_size=int(request_headers.get("content-length", 0)),
-            request_content_type=request_headers.get("content-type", EMPTY_VALUE),
-            request_headers=json.dumps(request_headers),
-            request_body=request_body,
-            remote_ip=request.client[0],  # type: ignore
-            remote_port=request.client[1],  # type: ignore
-            response_status_code=response.status_code,
-            response_size=int(response_headers.get("content-length", 0)),
-            response_headers=json.dumps(response_headers),
-            response_body=response_body.decode(),
-            duration=duration,
-        ).dict()
-        extra_fields.update({"to_mask": True})
-        if 0 <= response.status_code <= 299:
-            level = INFO
-        if 300 <= response.status_code <= 399:
-            level = WARNING
-        if 400 <= response.status_code <= 599:
-            level = ERROR
-        level = ERROR if exception_object else INFO
+        # milliseconds, rounded up
+        duration: int = (time.perf_counter_ns() - start_time + 999_999) // 1_000_000
+        # Initialization and formation of fields for request-response.
+        # Keys follow RequestResponseFields, values are already of the right types so the model is not used
+        extra_fields = {
+            "application_name": EMPTY_VALUE,
+            "request_uri": str(request.url),
+            "request_referrer": request.headers.get("referer", EMPTY_VALUE),
+            "request_protocol": await self.get_protocol(request),
+            "request_method": request.method,
+            "request_path": request.url.path,
+            "request_host": f"{server[0]}:{server[1]}",
+            "request_size": int(request.headers.get("content-length", 0)),
+            "request_content_type": request.headers.get("content-type", EMPTY_VALUE),
+            "request_headers": dumps(dict(request.headers.items())),
+            "request_body": request_body,
+            "request_direction": EMPTY_VALUE,
+            "remote_ip": request.client[0],  # type: ignore
+            "remote_port": str(request.client[1]),  # type: ignore
+            "response_status_code": response.status_code,
+            "response_size": int(response_headers.get("content-length", 0)),
+            "response_headers": dumps(response_headers),
+            "response_body": response_body.decode(),
+            "duration": duration,
+            "to_mask": True,
+        }
         message = (
             f'{"Error" if level==ERROR else "Responce"} '
             f"with code {response.status_code} "
@@ -138,10 +157,14 @@ class LoggingMiddleware(LogMiddleware):
         handler = logging.StreamHandler(sys.stdout)
         formatter = LoggingColoredLog(fmt=format, traceback_to_console=traceback_to_console, datefmt=datefmt)
         handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        self.handler = queue_handler(handler)
+        self.logger.addHandler(self.handler)
         self.logger.setLevel(level)
         reset_logging_handlers()
 
+    def _level_enabled(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
     async def _log(self, level: int, message: str, extra_fields: Dict[str, Any], exception_object: Exception):
         self.logger.log(
             level,
@@ -157,9 +180,13 @@ class LoguruMiddleware(LogMiddleware):
     ) -> None:
         format_ = format if traceback_to_console else loguru_format_without_traceback(format=format)
         logger.remove()
-        logger.add(sys.stderr, colorize=True, format=format_, backtrace=False, level=level)
+        # enqueue=True hands records to a multiprocessing queue, so writes to stderr don't block the event loop
+        logger.add(sys.stderr, colorize=True, format=format_, backtrace=False, level=level, enqueue=True)
         self.logger = logger
         loguru_reset_logging_handlers()
 
+    def _level_enabled(self, level: int) -> bool:
+        return loguru_level_enabled(level)
+
     async def _log(self, level: int, message: str, extra_fields: Dict[str, Any], exception_object: Exception):
         self.logger.opt(exception=exception_object).log(_levelToName[level], message, **extra_fields)
@@ -1,4 +1,5 @@
-from typing import Optional, Set, Union
+from functools import lru_cache
+from typing import FrozenSet, Optional, Union
 
 from pydantic import BaseModel
 
@@ -7,8 +8,11 @@ EMPTY_STR = ""
 
 class AdaptedModel(BaseModel):
     @classmethod
-    def get_fields_names(cls, alias=False) -> Set[str]:
-        return set(cls.schema(alias)["properties"].keys())
+    @lru_cache(maxsize=None)
+    def get_fields_names(cls, alias=False) -> FrozenSet[str]:
+        if alias:
+            return frozenset(cls.schema(by_alias=True)["properties"].keys())
+        return frozenset(cls.__fields__.keys())
 
 
 class RequestResponseFields(AdaptedModel):
@@ -35,3 +39,7 @@ class RequestResponseFields(AdaptedModel):
     response_headers: str = EMPTY_STR
     response_body: str = EMPTY_STR
     duration: Optional[int] = 0
+
+
+# blank request-response fields, copy it instead of building the model on every log record
+EMPTY_FIELDS = RequestResponseFields().dict()